@@ -16,14 +16,21 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
-    search_fields = (
+    list_select_related = (
+        'category',
         'author',
         'location',
-        'category',
+    )
+    search_fields = (
+        'title',
+        'author__username',
+        'location__name',
+        'category__title',
     )
     list_filter = (
         'category',
     )
+    list_per_page = 50
 
 
 admin.site.register(Category)
@@ -5,3 +5,11 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.urls import get_resolver
+
+        from . import signals  # noqa: F401
+
+        # Build the reverse lookup tables now, not on the first request.
+        get_resolver().reverse_dict
@@ -0,0 +1,65 @@
+from functools import wraps
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.views.decorators.cache import cache_page
+
+from core.utils import FastPaginator
+
+POSTS_VERSION_KEY = 'posts_version'
+
+
+def posts_version():
+    version = cache.get(POSTS_VERSION_KEY)
+    if version is None:
+        # A fresh value keeps entries saved before an eviction unreachable.
+        cache.add(POSTS_VERSION_KEY, time_ns(), None)
+        version = cache.get(POSTS_VERSION_KEY)
+    return version
+
+
+def invalidate_posts_cache():
+    try:
+        cache.incr(POSTS_VERSION_KEY)
+    except ValueError:
+        cache.set(POSTS_VERSION_KEY, time_ns(), None)
+
+
+def cache_posts_page(timeout):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            # The version is read once, so a save during rendering
+            # cannot file the stale page under the new version.
+            cached_view = cache_page(
+                timeout,
+                key_prefix='posts_v{}'.format(posts_version()),
+            )(view)
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def cached_page_object(posts, page_number, key):
+    paginator = FastPaginator(
+        posts,
+        settings.POSTS_ON_PAGE,
+        cache_version=posts_version(),
+    )
+    try:
+        number = paginator.validate_number(page_number)
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+    key = '{}:p:{}:v{}'.format(key, number, paginator.cache_version)
+    cached = cache.get(key)
+    if cached is None:
+        page_obj = paginator.page(number)
+        cache.set(key, page_obj.object_list, settings.PAGE_CACHE_TIMEOUT)
+        return page_obj
+    return Page(cached, number, paginator)
@@ -65,6 +65,18 @@ class Post(PublishedModel):
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = [
+            models.Index(fields=['-pub_date'], name='post_pubdate_desc'),
+            models.Index(
+                fields=['is_published', 'category', '-pub_date'],
+                name='post_category_pubdate',
+            ),
+            models.Index(
+                fields=['-pub_date'],
+                condition=models.Q(is_published=True),
+                name='post_pub_visible',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -82,3 +94,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created',
+            ),
+        ]
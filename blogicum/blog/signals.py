@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_posts_cache
+from .models import Category, Comment, Location, Post, User
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def posts_changed(**kwargs):
+    invalidate_posts_cache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def author_changed(update_fields=None, **kwargs):
+    # Logging in only updates last_login, which no cached page shows.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_posts_cache()
@@ -49,5 +49,4 @@ urlpatterns = [
         views.CategoryDetailView.as_view(),
         name='category_posts'
     ),
-    path('create/', views.PostCreatView.as_view(), name='create_post'),
 ]
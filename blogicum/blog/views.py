@@ -1,47 +1,135 @@
+from functools import lru_cache
+from math import ceil
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db.models import (
+    BooleanField, Count, ExpressionWrapper, IntegerField, OuterRef, Q, Subquery
+)
+from django.db.models.functions import Coalesce, Now
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
 
+from .cache import cache_posts_page, cached_page_object, posts_version
 from .forms import CommentForm, PostForm, UserForm
 from .models import Category, Comment, Post, User
 from core.utils import page_object
 
-
-def post_list(request):
-    posts = Post.objects.select_related(
+POST_CARD_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'image',
+    'is_published',
+    'author__username',
+    'category__slug',
+    'category__title',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
+
+
+@lru_cache
+def profile_url(username):
+    return reverse('blog:profile', kwargs={'username': username})
+
+
+def comment_count():
+    comments = Comment.objects.filter(
+        post=OuterRef('pk'),
+    ).order_by().values('post').annotate(count=Count('*')).values('count')
+    return Coalesce(
+        Subquery(comments, output_field=IntegerField()),
+        0,
+    )
+
+
+def post_cards(posts):
+    return posts.select_related(
         'category',
         'location',
         'author',
-    ).filter(
-        category__is_published=True,
+    ).only(
+        *POST_CARD_FIELDS
+    ).annotate(comment_count=comment_count()).order_by('-pub_date')
+
+
+def published(posts):
+    return posts.filter(
         is_published=True,
-        pub_date__lte=timezone.now(),
-    ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        category__is_published=True,
+        pub_date__lte=Now(),
+    )
+
+
+@cache_posts_page(settings.PAGE_CACHE_TIMEOUT)
+def post_list(request):
+    posts = post_cards(published(Post.objects))
     context = {
-        'page_obj': page_object(posts, request.GET.get('page'))
+        'page_obj': page_object(
+            posts,
+            request.GET.get('page'),
+            cache_version=posts_version(),
+        )
     }
     return render(request, 'blog/index.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    if (post.author != request.user
-        and (post.is_published is False
-             or post.category.is_published is False
-             or post.pub_date > timezone.now())):
+    post = get_object_or_404(
+        Post.objects.select_related(
+            'category',
+            'author',
+            'location',
+        ).annotate(
+            comment_count=comment_count(),
+            visible=ExpressionWrapper(
+                Q(is_published=True)
+                & Q(category__is_published=True)
+                & Q(pub_date__lte=Now()),
+                output_field=BooleanField(),
+            ),
+        ),
+        pk=post_id,
+    )
+    if post.author_id != request.user.id and not post.visible:
         return render(request, 'pages/404.html', status=404)
-    comments = post.comments.select_related('author')
     context = {
         'post': post,
         'form': CommentForm(),
-        'comments': comments
+        'page_obj': page_object(
+            post.comments.select_related('author').order_by('created_at'),
+            request.GET.get('page'),
+            settings.COMMENTS_ON_PAGE,
+            count=post.comment_count,
+        ),
     }
     return render(request, 'blog/detail.html', context)
 
 
+class AuthorRequiredMixin:
+
+    def dispatch(self, request, *args, **kwargs):
+        pk = self.kwargs[self.pk_url_kwarg]
+        self.object = self.model.objects.filter(
+            pk=pk,
+            author_id=request.user.id,
+        ).first()
+        if self.object is None:
+            if not self.model.objects.filter(pk=pk).exists():
+                raise Http404
+            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        return self.object
+
+
 class PostMixin:
     model = Post
     form_class = PostForm
@@ -60,41 +148,29 @@ class PostCreatView(LoginRequiredMixin, PostMixin, CreateView):
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:profile',
-                       kwargs={'username': self.request.user})
+        return profile_url(self.request.user.username)
 
 
-class PostUpdateView(LoginRequiredMixin, PostMixin, UpdateView):
+class PostUpdateView(AuthorRequiredMixin, LoginRequiredMixin,
+                     PostMixin, UpdateView):
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if instance.author != self.request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self):
         return reverse('blog:post_detail',
                        kwargs={'post_id': self.kwargs['post_id']})
 
 
-class PostDeleteView(LoginRequiredMixin, PostMixin, DeleteView):
+class PostDeleteView(AuthorRequiredMixin, LoginRequiredMixin,
+                     PostMixin, DeleteView):
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if instance.author != self.request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["form"] = self.form_class(instance=self.object)
         return context
 
     def get_success_url(self):
-        return reverse('blog:profile',
-                       kwargs={'username': self.request.user})
+        return profile_url(self.request.user.username)
 
 
 class CommentMixin:
@@ -123,43 +199,39 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:post_detail',
-                       kwargs={'post_id': self.kwargs['post_id']})
+        last_page = ceil(
+            self.object.post.comments.count() / settings.COMMENTS_ON_PAGE
+        )
+        return '{}?page={}#comment_{}'.format(
+            reverse('blog:post_detail',
+                    kwargs={'post_id': self.kwargs['post_id']}),
+            last_page,
+            self.object.id,
+        )
 
 
-class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
+class CommentUpdateView(AuthorRequiredMixin, LoginRequiredMixin,
+                        CommentMixin, UpdateView):
     form_class = CommentForm
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Comment, pk=self.kwargs['comment_id'])
-        if instance.author != self.request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
-
-class CommentDeleteView(LoginRequiredMixin, CommentMixin, DeleteView):
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Comment, pk=self.kwargs['comment_id'])
-        if instance.author != self.request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+class CommentDeleteView(AuthorRequiredMixin, LoginRequiredMixin,
+                        CommentMixin, DeleteView):
+    pass
 
 
 def profile(request, username):
     profile = get_object_or_404(User, username=username)
-    page_obj = profile.posts.order_by(
-        '-pub_date',
-    ).annotate(comment_count=Count('comments'))
-    if profile != request.user:
-        page_obj = page_obj.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now(),
-        )
+    posts = profile.posts.all()
+    if profile.id != request.user.id:
+        posts = published(posts)
     context = {
         'profile': profile,
-        'page_obj': page_object(page_obj, request.GET.get('page')),
+        'page_obj': page_object(
+            post_cards(posts),
+            request.GET.get('page'),
+            cache_version=posts_version(),
+        ),
     }
     return render(request, 'blog/profile.html', context)
 
@@ -173,10 +245,13 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
     def get_success_url(self):
-        return reverse('blog:profile',
-                       kwargs={'username': self.request.user})
+        return profile_url(self.request.user.username)
 
 
+@method_decorator(
+    cache_posts_page(settings.PAGE_CACHE_TIMEOUT),
+    name='dispatch',
+)
 class CategoryDetailView(DetailView):
     model = Category
     template_name = 'blog/category.html'
@@ -184,20 +259,22 @@ class CategoryDetailView(DetailView):
     slug_url_kwarg = 'category_slug'
 
     def dispatch(self, request, *args, **kwargs):
-        get_object_or_404(
+        self.object = get_object_or_404(
             self.model,
             is_published=True,
             slug=self.kwargs['category_slug']
         )
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.object
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        posts = self.get_object().posts.filter(
-            is_published=True,
-            pub_date__lte=timezone.now(),
-        ).order_by('-pub_date').annotate(
-            comment_count=Count('comments')
+        posts = post_cards(published(self.object.posts))
+        context['page_obj'] = cached_page_object(
+            posts,
+            self.request.GET.get('page'),
+            'cat:{}'.format(self.object.slug),
         )
-        context['page_obj'] = page_object(posts, self.request.GET.get('page'))
         return context
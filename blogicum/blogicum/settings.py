@@ -129,3 +129,9 @@ LOGIN_REDIRECT_URL = 'blog:index'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 POSTS_ON_PAGE = 10  # количество выводимых постов на страницу
+
+COMMENTS_ON_PAGE = 10  # количество выводимых комментариев на страницу поста
+
+PAGINATOR_COUNT_TIMEOUT = 30  # время кеширования количества объектов пагинатора, в секундах
+
+PAGE_CACHE_TIMEOUT = 30  # время кеширования страниц ленты и категорий, в секундах
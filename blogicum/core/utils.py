@@ -1,9 +1,62 @@
+from hashlib import md5
+
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
 from django.conf import settings
 
 
-def page_object(data, page_number):
-    paginator = Paginator(data, settings.POSTS_ON_PAGE)
+class FastPaginator(Paginator):
+    def __init__(self, *args, cache_version=None, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_version = cache_version
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self):
+        if (self.cache_version is None
+                or not hasattr(self.object_list, 'query')):
+            return super().count
+        key = 'paginator_count:{}:{}'.format(
+            self.cache_version,
+            md5(str(self.object_list.query).encode()).hexdigest(),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.values('pk').count()
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+    def page(self, number):
+        if not hasattr(self.object_list, 'values_list'):
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(self.slice(bottom, top), number, self)
+
+    def slice(self, bottom, top):
+        pks = list(
+            self.object_list.values_list('pk', flat=True)[bottom:top]
+        )
+        position = {pk: index for index, pk in enumerate(pks)}
+        return sorted(
+            self.object_list.filter(pk__in=pks),
+            key=lambda obj: position[obj.pk],
+        )
+
+
+def page_object(data, page_number, per_page=None, cache_version=None,
+                count=None):
+    paginator = FastPaginator(
+        data,
+        per_page or settings.POSTS_ON_PAGE,
+        cache_version=cache_version,
+        count=count,
+    )
     page_obj = paginator.get_page(page_number)
     return page_obj
@@ -1,3 +1,4 @@
+import random
 from datetime import datetime, timedelta
 from typing import Tuple
 
@@ -132,3 +133,17 @@ def create_post_context_form_item(
         ),
     )
     return result
+
+
+@pytest.fixture
+def shuffled_posts(mixer, user, published_category):
+    now = datetime.now(tz=pytz.UTC)
+    days_ago = list(range(1, 8))
+    random.shuffle(days_ago)
+    return mixer.cycle(len(days_ago)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(days=days) for days in days_ago),
+    )
@@ -0,0 +1,125 @@
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.cache import (
+    cache_posts_page, cached_page_object, invalidate_posts_cache,
+    posts_version,
+)
+from blog.models import Comment, Post
+from blog.views import post_cards, published
+from core.utils import page_object
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def listing():
+    return post_cards(published(Post.objects))
+
+
+@pytest.mark.django_db
+def test_cached_page_is_invalidated_by_comment_changes(
+        mixer, user, shuffled_posts
+):
+    def comment_counts():
+        return {
+            post.pk: post.comment_count
+            for post in cached_page_object(listing(), 1, 'test')
+        }
+
+    post = shuffled_posts[0]
+    assert comment_counts()[post.pk] == 0
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert comment_counts()[post.pk] == 1
+    Comment.objects.filter(pk=comment.pk).update(text='edited')
+    assert comment_counts()[post.pk] == 1
+    comment.delete()
+    assert comment_counts()[post.pk] == 0
+
+
+@pytest.mark.django_db
+def test_cached_page_key_uses_resolved_page_number(shuffled_posts):
+    first_page = list(cached_page_object(listing(), 1, 'test'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for page_number in ('a b', 'x' * 300, '0', '-1', '999'):
+            cached_page_object(listing(), page_number, 'test')
+    assert list(cached_page_object(listing(), 'a b', 'test')) == first_page
+    assert sorted(
+        key for key in cache._cache if ':test:p:' in key
+    ) == [cache.make_key('test:p:1:v{}'.format(cache.get('posts_version')))]
+
+
+def test_page_saved_during_render_is_not_served_after_the_change():
+    renders = []
+
+    @cache_posts_page(60)
+    def view(request):
+        renders.append(1)
+        if len(renders) == 1:
+            invalidate_posts_cache()
+        return HttpResponse('page {}'.format(len(renders)))
+
+    def get():
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        return view(request).content
+
+    assert get() == b'page 1'
+    assert get() == b'page 2'
+    assert get() == b'page 2'
+
+
+@pytest.mark.django_db
+def test_cached_index_follows_author_rename(client, user, shuffled_posts):
+    old_username = user.username
+    assert old_username in client.get('/').content.decode()
+    user.username = 'renamed_author'
+    user.save()
+    content = client.get('/').content.decode()
+    assert '/profile/renamed_author/' in content
+    assert '/profile/{}/'.format(old_username) not in content
+
+
+@pytest.mark.django_db
+def test_login_keeps_cached_pages(client, user, shuffled_posts):
+    version = posts_version()
+    client.force_login(user)
+    assert posts_version() == version
+
+
+@pytest.mark.django_db
+def test_cached_count_is_invalidated_by_post_changes(
+        mixer, user, published_category, shuffled_posts
+):
+    def count():
+        return page_object(
+            listing(), 1, cache_version=posts_version()
+        ).paginator.count
+
+    assert count() == len(shuffled_posts)
+    # Queryset updates send no signals, so the cached count is served.
+    Post.objects.filter(pk=shuffled_posts[0].pk).update(is_published=False)
+    assert count() == len(shuffled_posts)
+
+    shuffled_posts[1].delete()
+    assert count() == len(shuffled_posts) - 2
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1),
+    )
+    assert count() == len(shuffled_posts) - 1
@@ -0,0 +1,28 @@
+import pytest
+
+from blog.models import Post
+from blog.views import post_cards, published
+from core.utils import FastPaginator
+
+
+def listing():
+    return post_cards(published(Post.objects))
+
+
+@pytest.mark.django_db
+def test_pages_keep_queryset_order(shuffled_posts):
+    expected = list(listing())
+    paginator = FastPaginator(listing(), 3)
+    pages = [
+        list(paginator.page(number)) for number in paginator.page_range
+    ]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == expected
+
+
+@pytest.mark.django_db
+def test_orphans_join_last_page(shuffled_posts):
+    expected = list(listing())
+    paginator = FastPaginator(listing(), 3, orphans=1)
+    assert paginator.num_pages == 2
+    assert list(paginator.page(2)) == expected[3:]
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.test import override_settings
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+@override_settings(COMMENTS_ON_PAGE=2)
+def test_new_comment_redirects_to_its_page(mixer, user, user_client, post):
+    mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Новый комментарий"}
+    )
+    comment = post.comments.get(text="Новый комментарий")
+    assert response.url == (
+        f"/posts/{post.id}/?page=2#comment_{comment.id}"
+    )
+    page = user_client.get(response.url).content.decode()
+    assert "Новый комментарий" in page
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ("edit", "delete"))
+def test_post_author_required(action, another_user_client, post):
+    response = another_user_client.get(f"/posts/{post.id}/{action}/")
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
+    missing = another_user_client.get(f"/posts/{post.id + 1}/{action}/")
+    assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("action", ("edit_comment", "delete_comment"))
+def test_comment_author_required(
+        action, mixer, user, user_client, another_user_client, post
+):
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    url = f"/posts/{post.id}/{action}/{comment.id}"
+    if action == "delete_comment":
+        url += "/"
+    assert user_client.get(url).status_code == 200
+    response = another_user_client.get(url)
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
+    missing = another_user_client.get(url.replace(
+        f"/{comment.id}", f"/{comment.id + 1}"
+    ))
+    assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("post_fields", "category_published"),
+    (
+        ({"is_published": False}, True),
+        ({}, False),
+        ({"pub_date": datetime.now(tz=pytz.UTC) + timedelta(days=1)}, True),
+    ),
+)
+def test_hidden_post_is_visible_to_its_author_only(
+        post_fields, category_published, user_client, another_user_client,
+        post
+):
+    post.category.is_published = category_published
+    post.category.save()
+    for field, value in post_fields.items():
+        setattr(post, field, value)
+    post.save()
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == 200
+    assert another_user_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_published_post_is_visible_to_everyone(another_user_client, post):
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 200